@@ -1,28 +1,26 @@
 #!/usr/bin/env python3
 
 import pandas as pd
-import unicodedata
+import numpy as np
+import re
+import heapq
 import os
+import sys
 import shutil
+import pickle
+import hashlib
 from datetime import datetime
-
-def normalize_school_name(name):
-    """Normalize school name for comparison"""
-    if pd.isna(name) or not isinstance(name, str):
-        return ""
-    normalized = unicodedata.normalize('NFC', name.strip())
-    return normalized.replace('­', '')
-
-def parse_decimal_comma(value):
-    """Parse Estonian decimal comma format"""
-    if pd.isna(value) or value == "" or value == "—":
-        return None
-    if isinstance(value, (int, float)):
-        return float(value)
-    try:
-        return float(str(value).replace(',', '.'))
-    except:
-        return None
+from operator import attrgetter
+from pathlib import Path
+from string import Template
+from types import SimpleNamespace
+from concurrent.futures import ThreadPoolExecutor
+
+def parse_decimal_comma(values: pd.Series) -> pd.Series:
+    """Parse a column in Estonian decimal comma format (unparseable cells become NaN)"""
+    parsed = pd.to_numeric(values.astype('string').str.replace(',', '.', regex=False), errors='coerce')
+    # Plain float64 whatever the CSV backend, so score arithmetic runs as NumPy ufuncs
+    return parsed.astype('float64')
 
 def format_score(score):
     """Format score with Estonian comma"""
@@ -32,33 +30,42 @@ def format_score(score):
 
 def backup_previous_report(report_filename):
     """Backup previous HTML report with timestamp"""
-    if os.path.exists(report_filename):
-        # Create backup directory if it doesn't exist
-        backup_dir = 'report_backups'
-        if not os.path.exists(backup_dir):
-            os.makedirs(backup_dir)
-            print(f"📁 Created backup directory: {backup_dir}")
-        
-        # Get current timestamp
-        timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-        
-        # Create backup filename
-        name, ext = os.path.splitext(report_filename)
-        backup_filename = f"{name}_{timestamp}{ext}"
-        backup_path = os.path.join(backup_dir, backup_filename)
-        
-        # Move the file to backup
-        shutil.move(report_filename, backup_path)
-        print(f"📦 Backed up previous report: {backup_path}")
-        return backup_path
-    else:
+    # Create backup directory if it doesn't exist
+    backup_dir = Path('report_backups')
+    try:
+        backup_dir.mkdir(parents=True)
+        print(f"📁 Created backup directory: {backup_dir}")
+    except FileExistsError:
+        pass
+    
+    # Get current timestamp
+    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
+    
+    # Create backup filename
+    name, ext = os.path.splitext(report_filename)
+    backup_filename = f"{name}_{timestamp}{ext}"
+    backup_path = os.path.join(backup_dir, backup_filename)
+    
+    # Move the file to backup (a plain rename unless it crosses filesystems)
+    try:
+        os.replace(report_filename, backup_path)
+    except FileNotFoundError:
         print("📝 No previous report found - creating new one")
         return None
+    except OSError:
+        shutil.move(report_filename, backup_path)
+    print(f"📦 Backed up previous report: {backup_path}")
+    return backup_path
 
-def normalize(text: str) -> str:
-    """NFC normalize, strip extra whitespace and lowercase"""
-    text = unicodedata.normalize('NFKC', text)
-    return text.strip().lower()
+def write_report(report_filename, html_bytes):
+    """Write the encoded report straight to the file descriptor (no buffer copy)"""
+    fd = os.open(report_filename, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+    try:
+        view = memoryview(html_bytes)
+        while view:
+            view = view[os.write(fd, view):]
+    finally:
+        os.close(fd)
 
 # Expand this list whenever you add new "odd‐ball" Tallinn schools
 EXTRA_TALLINN_SCHOOLS = {
@@ -80,197 +87,242 @@ PRIVATE_SCHOOLS = {
     'audentese spordigümnaasium'
 }
 
-def is_tallinn_school(school_name: str) -> bool:
+# Highly competitive schools (admission is extremely difficult - "reach" schools only)
+HIGHLY_COMPETITIVE_SCHOOLS = [
+    'Tallinna Reaalkool',
+    'Tallinna Inglise Kolledž',
+    'Gustav Adolfi Gümnaasium',
+    'Tallinna Prantsuse Lütseum',
+    'Tallinna 21. Kool',
+    'Kadrioru Saksa Gümnaasium'
+]
+
+# One alternation per set, so each name is scanned once instead of once per entry
+# (plain pattern strings - the Series .str methods compile them in their own engine)
+TALLINN_PATTERN = '|'.join(re.escape(s) for s in ['tallinn', *sorted(EXTRA_TALLINN_SCHOOLS)])
+PRIVATE_PATTERN = '|'.join(re.escape(s) for s in sorted(PRIVATE_SCHOOLS))
+COMPETITIVE_PATTERN = '|'.join(re.escape(s) for s in HIGHLY_COMPETITIVE_SCHOOLS)
+
+def is_tallinn_school(names: pd.Series) -> pd.Series:
     """
-    Returns True if the given school_name is located in Tallinn.
+    Returns a boolean mask marking the normalized school names located in Tallinn.
     1) Any name containing 'tallinn'
     2) Any of the known exception names in EXTRA_TALLINN_SCHOOLS
+       (using substring match to catch variants)
     """
-    if not school_name:
-        return False
+    return names.str.contains(TALLINN_PATTERN, regex=True)
 
-    name = normalize(school_name)
-
-    # 1) names containing the string 'tallinn'
-    if 'tallinn' in name:
-        return True
+def is_private_school(names: pd.Series) -> pd.Series:
+    """
+    Returns a boolean mask marking the normalized school names (see read_csv_data)
+    that are private schools.
+    """
+    return names.str.contains(PRIVATE_PATTERN, regex=True)
 
-    # 2) exact-match against our expanded exception set
-    #    (using substring match to catch variants)
-    for exc in EXTRA_TALLINN_SCHOOLS:
-        if exc in name:
-            return True
+# Columns of the ranking CSVs used by the report
+CSV_COLUMNS = ['Place', 'Kool', 'Kokku', 'Matemaatika', 'Eesti keel', 'Inglise keel']
+# Names and decimal-comma scores are read as text by the C parser (scores are parsed
+# afterwards), so it does not have to infer their types
+CSV_DTYPES = {'Kool': str, 'Kokku': str, 'Matemaatika': str, 'Eesti keel': str, 'Inglise keel': str}
+# Placeholders used for missing values (on top of pandas' defaults such as empty cells)
+MISSING_VALUES = ['—', '-', 'N/A']
 
-    return False
+# Text escaping for HTML element content (same as html.escape(..., quote=False))
+HTML_ESCAPES = str.maketrans({'&': '&amp;', '<': '&lt;', '>': '&gt;'})
 
-def is_private_school(school_name: str) -> bool:
-    """
-    Returns True if the given school_name is a private school.
-    """
-    if not school_name:
-        return False
+def load_csv(filename):
+    """Load the used CSV columns, preferring the multithreaded pyarrow parser"""
+    try:
+        return pd.read_csv(filename, engine='pyarrow', usecols=CSV_COLUMNS, na_values=MISSING_VALUES,
+                           dtype_backend='pyarrow')
+    except ImportError:
+        # pyarrow not installed - fall back to pandas' C parser
+        return pd.read_csv(filename, engine='c', usecols=CSV_COLUMNS, dtype=CSV_DTYPES,
+                           na_values=MISSING_VALUES)
+
+def read_csv_data(filename):
+    """Read and process CSV data for a specific year (indexed by school name)"""
+    df = load_csv(filename)
     
-    name = normalize(school_name)
+    # Normalize school names column-wise (non-string cells become "")
+    df['Kool'] = (df['Kool'].str.strip()
+                  .str.normalize('NFC')
+                  .str.replace('\u00ad', '', regex=False)
+                  .fillna(''))
+    # Comparison form, computed once: NFKC normalize, strip and lowercase
+    df['Kool_norm'] = df['Kool'].str.normalize('NFKC').str.strip().str.lower()
+    df = df[(df['Kool'] != '') & is_tallinn_school(df['Kool_norm'])]  # Filter for Tallinn schools
     
-    for private_school in PRIVATE_SCHOOLS:
-        if private_school in name:
-            return True
+    # Intern the names: the yearly frames are joined on them, so the same school
+    # from different years becomes one string object and keys compare by identity
+    names = pd.Index([sys.intern(name) for name in df['Kool']], dtype=object, name='Kool')
     
-    return False
+    data = pd.DataFrame({
+        'Place': pd.to_numeric(df['Place'], errors='coerce').astype('Int64'),
+        'Kokku': parse_decimal_comma(df['Kokku']),
+        'Math': parse_decimal_comma(df['Matemaatika']),
+        'Estonian': parse_decimal_comma(df['Eesti keel']),
+        'English': parse_decimal_comma(df['Inglise keel']),
+        'Norm': df['Kool_norm']
+    }).set_index(names)
+    data = data[~data.index.duplicated(keep='last')]  # Later rows win for duplicate names
+    return data
+
+# Parsed CSV data is cached here between runs
+CACHE_DIR = Path('.cache')
 
-def read_csv_data(filename, year):
-    """Read and process CSV data for a specific year"""
-    print(f"Reading {filename}...")
-    df = pd.read_csv(filename)
+def load_yearly_data(years):
+    """Read the CSV data for all years, reusing the cached result while the inputs are unchanged"""
+    # Key on the CSV files and this script, so edits to either invalidate the cache
+    sources = [f'Edetabel {year}.csv' for year in years] + [__file__]
+    stamps = '|'.join(f"{path}:{os.stat(path).st_mtime_ns}:{os.stat(path).st_size}" for path in sources)
+    key = hashlib.blake2b(stamps.encode('utf-8'), digest_size=16).hexdigest()
+    cache_path = CACHE_DIR / f'schools_{key}.pkl'
     
-    data = {}
-    for _, row in df.iterrows():
-        school = normalize_school_name(row.get('Kool', ''))
-        if school and is_tallinn_school(school):  # Filter for Tallinn schools
-            data[school] = {
-                'Place': row.get('Place'),
-                'Kokku': parse_decimal_comma(row.get('Kokku')),
-                'Math': parse_decimal_comma(row.get('Matemaatika')),
-                'Estonian': parse_decimal_comma(row.get('Eesti keel')),
-                'English': parse_decimal_comma(row.get('Inglise keel'))
-            }
+    try:
+        with open(cache_path, 'rb') as f:
+            data = pickle.load(f)
+        print(f"Using cached CSV data: {cache_path}")
+        return data
+    except (OSError, EOFError, pickle.UnpicklingError, AttributeError, ImportError, ValueError):
+        pass  # Missing, truncated or unreadable (e.g. written by another pandas) - parse again
+    
+    # One thread per file - the CSV parsers release the GIL. Progress is printed
+    # from this thread only, in year order, so lines from the workers never mix
+    with ThreadPoolExecutor(max_workers=len(years)) as executor:
+        futures = {}
+        for year in years:
+            print(f"Reading Edetabel {year}.csv...")
+            futures[year] = executor.submit(read_csv_data, f'Edetabel {year}.csv')
+        data = []
+        for year in years:
+            data.append(futures[year].result())
+            print(f"Found {len(data[-1])} Tallinn schools in {year}")
     
-    print(f"Found {len(data)} Tallinn schools in {year}")
+    CACHE_DIR.mkdir(exist_ok=True)
+    # Drop pickles for older inputs, then write the new one atomically (temp file + replace)
+    for old_path in CACHE_DIR.glob('schools_*.pkl'):
+        if old_path != cache_path:
+            old_path.unlink(missing_ok=True)
+    tmp_cache_path = cache_path.with_name(f'{cache_path.name}.tmp')
+    with open(tmp_cache_path, 'wb') as f:
+        pickle.dump(data, f, protocol=5)
+    os.replace(tmp_cache_path, cache_path)
     return data
 
 # Load all original CSV data
 print("Loading original CSV data files...")
-data_2018 = read_csv_data('Edetabel 2018.csv', '2018')
-data_2023 = read_csv_data('Edetabel 2023.csv', '2023')
-data_2024 = read_csv_data('Edetabel 2024.csv', '2024')
-
-# Combine all schools (union of all years)
-all_schools = set()
-all_schools.update(data_2018.keys())
-all_schools.update(data_2023.keys())
-all_schools.update(data_2024.keys())
-
-print(f"Total unique Tallinn schools across all years: {len(all_schools)}")
-
-# Create consolidated data
-schools_data = []
-for school in all_schools:
-    school_2018 = data_2018.get(school, {})
-    school_2023 = data_2023.get(school, {})
-    school_2024 = data_2024.get(school, {})
-    
-    # Format places as integers (remove .0)
-    def format_place(place):
-        if place == '—' or place is None or pd.isna(place):
-            return '—'
-        try:
-            return str(int(float(place)))
-        except:
-            return str(place)
-    
-    school_record = {
-        'School': school,
-        # Use original NATIONAL places from CSV files (among ALL Estonian schools)
-        'Place_2018': format_place(school_2018.get('Place', '—')),
-        'Place_2023': format_place(school_2023.get('Place', '—')),
-        'Place_2024': format_place(school_2024.get('Place', '—')),
-        # Use original scores
-        'Kokku_2018': school_2018.get('Kokku'),
-        'Kokku_2023': school_2023.get('Kokku'),
-        'Kokku_2024': school_2024.get('Kokku'),
-        'Math_2018': school_2018.get('Math'),
-        'Math_2023': school_2023.get('Math'),
-        'Math_2024': school_2024.get('Math'),
-        'Estonian_2018': school_2018.get('Estonian'),
-        'Estonian_2023': school_2023.get('Estonian'),
-        'Estonian_2024': school_2024.get('Estonian'),
-        'English_2018': school_2018.get('English'),
-        'English_2023': school_2023.get('English'),
-        'English_2024': school_2024.get('English')
-    }
-    
-    schools_data.append(school_record)
-
-# Sort by 2024 total score (for display order)
-schools_data.sort(key=lambda x: x['Kokku_2024'] if x['Kokku_2024'] else -1, reverse=True)
-
-# Calculate trends and categories
+years = ('2018', '2023', '2024')
+data_2018, data_2023, data_2024 = load_yearly_data(years)
+
+# Combine all schools (outer join of all years on the school name), keeping the
+# original NATIONAL places (among ALL Estonian schools) and original scores
+schools = (data_2018.add_suffix('_2018')
+           .join([data_2023.add_suffix('_2023'), data_2024.add_suffix('_2024')], how='outer')
+           .rename_axis('School').reset_index())
+# Normalized name from the most recent year the school appears in
+schools['School_norm'] = schools['Norm_2024'].fillna(schools['Norm_2023']).fillna(schools['Norm_2018'])
+schools = schools.drop(columns=['Norm_2018', 'Norm_2023', 'Norm_2024'])
+
+print(f"Total unique Tallinn schools across all years: {len(schools)}")
+
+# Calculate trends and categories column-wise
+
+# Score trends
+schools['trend_1yr'] = schools['Kokku_2024'] - schools['Kokku_2023']
+schools['trend_6yr'] = schools['Kokku_2024'] - schools['Kokku_2018']
+
+# Place trends (improvement = lower number, so positive = improvement)
+places = {year: schools[f'Place_{year}'].astype('Int64') for year in years}
+schools['place_change_6yr'] = places['2018'] - places['2024']
+schools['place_change_1yr'] = places['2023'] - places['2024']
+
+# Display places as integers, '—' when the school is missing that year
+for year, place in places.items():
+    schools[f'Place_{year}'] = place.astype('string').fillna('—')
+
+# Display 2024 scores once per column, with Estonian decimal comma (see format_score)
+for col in ['Kokku_2024', 'Math_2024', 'Estonian_2024', 'English_2024']:
+    # astype(object): a column with no scores at all maps to float NaN, which .str rejects
+    schools[f'{col}_str'] = (schools[col].map('{:.1f}'.format, na_action='ignore').astype(object)
+                             .str.replace('.', ',', regex=False).fillna('—'))
+
+# Performance category (250+ excellent, 200+ very good, 150+ good)
+schools['category'] = (pd.cut(schools['Kokku_2024'], [-np.inf, 150, 200, 250, np.inf],
+                              right=False, labels=['average', 'good', 'very-good', 'excellent'])
+                       .astype(object).fillna('no-data'))
+
+# Trend category based on place improvement (more than 5 places either way)
+place_trend = schools['place_change_1yr'].fillna(0).to_numpy(dtype=int)
+trend_conditions = [place_trend > 5, place_trend < -5]
+# Categoricals, so every row shares one string object per label (as with category above)
+schools['trend_cat'] = pd.Categorical(np.select(trend_conditions, ['improving', 'declining'], default='stable'))
+schools['trend_arrow'] = pd.Categorical(np.select(trend_conditions, ['↗️', '↘️'], default='→'))
+
+# Private and highly competitive flags (competitive is matched on the display name)
+schools['is_private'] = is_private_school(schools['School_norm'])
+schools['is_competitive'] = schools['School'].str.contains(COMPETITIVE_PATTERN, regex=True)
+
+# School names come straight from the CSVs - escape them once for HTML output.
+# Scores, places and the category/trend columns are generated here and need no escaping.
+schools['School_html'] = schools['School'].str.translate(HTML_ESCAPES)
+
+# Table row presentation: private schools first, then highly competitive ones
+row_kind = [schools['is_private'].to_numpy(dtype=bool), schools['is_competitive'].to_numpy(dtype=bool)]
+schools['row_class'] = pd.Categorical(np.select(row_kind, [' class="private-school"', ' class="highly-competitive"'], default=''))
+schools['School_cell'] = schools['School_html'] + np.select(row_kind, [' 💼', ' ⭐'], default='')
+schools['performance'] = pd.Categorical(np.select(row_kind, ['Private School', 'Highly Competitive'],
+                                                  default=schools['category'].str.title().str.replace('-', ' ')))
+
+# Sort by 2024 total score (for display order, schools without a 2024 score last)
+schools = schools.sort_values('Kokku_2024', ascending=False, na_position='last', kind='stable').reset_index(drop=True)
+
+# Back to rows for the HTML generation below: namedtuples with attribute access, which are
+# much smaller than per-row dicts (missing values as None)
+schools_data = list(schools.astype(object).where(schools.notna(), None).itertuples(index=False, name='School'))
+
+# Single pass over the schools: statistics and recommendation candidates
+# (schools_data is already in Kokku_2024 order, so each candidate list is too)
+top_performer = None
+excellent_count = improving_count = 0
+accessible_excellent, improving_schools, solid_schools, accessible_schools = [], [], [], []
 for school in schools_data:
-    # Score trends
-    if school['Kokku_2023'] and school['Kokku_2024']:
-        school['trend_1yr'] = school['Kokku_2024'] - school['Kokku_2023']
-    else:
-        school['trend_1yr'] = None
-        
-    if school['Kokku_2018'] and school['Kokku_2024']:
-        school['trend_6yr'] = school['Kokku_2024'] - school['Kokku_2018']
-    else:
-        school['trend_6yr'] = None
-    
-    # Place trends (improvement = lower number)
-    def parse_place(place_str):
-        """Parse place string to number, return None if not valid"""
-        if place_str == '—' or place_str is None:
-            return None
-        try:
-            return int(place_str)
-        except (ValueError, TypeError):
-            return None
-    
-    place_2018 = parse_place(school['Place_2018'])
-    place_2023 = parse_place(school['Place_2023'])
-    place_2024 = parse_place(school['Place_2024'])
-    
-    if place_2018 and place_2024:
-        school['place_change_6yr'] = place_2018 - place_2024  # positive = improvement
-    else:
-        school['place_change_6yr'] = None
-        
-    if place_2023 and place_2024:
-        school['place_change_1yr'] = place_2023 - place_2024  # positive = improvement
-    else:
-        school['place_change_1yr'] = None
-    
-    # Performance category
-    kokku = school['Kokku_2024']
-    if kokku is None:
-        school['category'] = 'no-data'
-    elif kokku >= 250:
-        school['category'] = 'excellent'
-    elif kokku >= 200:
-        school['category'] = 'very-good'
-    elif kokku >= 150:
-        school['category'] = 'good'
-    else:
-        school['category'] = 'average'
+    kokku = school.Kokku_2024
+    category = school.category
+    trend_cat = school.trend_cat
     
-    # Check if school is private
-    school['is_private'] = is_private_school(school['School'])
+    # Statistics
+    if kokku and (top_performer is None or kokku > top_performer.Kokku_2024):
+        top_performer = school
+    if category == 'excellent':
+        excellent_count += 1
+    if trend_cat == 'improving':
+        improving_count += 1
     
-    # Trend category based on place improvement
-    place_trend = school['place_change_1yr'] or 0
-    if place_trend > 5:  # improved by more than 5 places
-        school['trend_cat'] = 'improving'
-        school['trend_arrow'] = '↗️'
-    elif place_trend < -5:  # declined by more than 5 places
-        school['trend_cat'] = 'declining'
-        school['trend_arrow'] = '↘️'
-    else:
-        school['trend_cat'] = 'stable'
-        school['trend_arrow'] = '→'
+    # Recommendation candidates (only public schools with a 2024 score)
+    if not kokku or school.is_private:
+        continue
+    if trend_cat == 'improving':
+        improving_schools.append(school)
+    if category == 'good' and trend_cat == 'stable':
+        solid_schools.append(school)
+    if category in ('very-good', 'good') and not school.is_competitive:
+        accessible_schools.append(school)
+        if category == 'very-good':
+            accessible_excellent.append(school)
 
 print(f"Processed {len(schools_data)} schools")
 
 # Calculate statistics
 stats = {
     'total_schools': len(schools_data),
-    'top_performer': max((s for s in schools_data if s['Kokku_2024']), key=lambda x: x['Kokku_2024'], default={'School': 'N/A', 'Kokku_2024': 0}),
-    'excellent_count': len([s for s in schools_data if s['category'] == 'excellent']),
-    'improving_count': len([s for s in schools_data if s['trend_cat'] == 'improving'])
+    'top_performer': top_performer or SimpleNamespace(School='N/A', School_html='N/A', Kokku_2024=0),
+    'excellent_count': excellent_count,
+    'improving_count': improving_count
 }
 
-# Generate HTML with national rankings clearly indicated
-html_content = f'''<!DOCTYPE html>
+# Page templates (string.Template - ${name} placeholders, CSS braces stay as-is)
+HEADER_TMPL = Template('''<!DOCTYPE html>
 <html lang="en">
 <head>
     <meta charset="UTF-8">
@@ -278,325 +330,333 @@ html_content = f'''<!DOCTYPE html>
     <title>Tallinn Schools Selection Guide 2024 - National Rankings</title>
     <link href="https://fonts.googleapis.com/css2?family=Inter:wght@300;400;500;600;700&display=swap" rel="stylesheet">
     <style>
-        body {{
+        body {
             font-family: 'Inter', 'Segoe UI', Tahoma, Geneva, Verdana, sans-serif;
             margin: 0;
             padding: 15px;
             background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
             color: #333;
             font-size: 14px;
-        }}
+        }
         
-        .container {{
+        .container {
             max-width: 1400px;
             margin: 0 auto;
             background: white;
             border-radius: 16px;
             overflow: hidden;
             box-shadow: 0 25px 50px rgba(0,0,0,0.15);
-        }}
+        }
         
-        .header {{
+        .header {
             text-align: center;
             background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
             color: white;
             padding: 20px 30px;
             margin: 0;
-        }}
+        }
         
-        .header h1 {{
+        .header h1 {
             margin: 0;
             font-size: 2.2em;
             font-weight: 600;
             letter-spacing: -1px;
-        }}
+        }
         
-        .header p {{
+        .header p {
             margin: 8px 0 0 0;
             font-size: 1em;
             opacity: 0.95;
-        }}
+        }
         
-        .content {{
+        .content {
             padding: 20px;
-        }}
+        }
         
-        .national-notice {{
+        .national-notice {
             background: #e0f2fe;
             border: 1px solid #0288d1;
             border-radius: 8px;
             padding: 12px;
             margin-bottom: 16px;
             text-align: center;
-        }}
+        }
         
-        .national-notice h4 {{
+        .national-notice h4 {
             color: #0277bd;
             margin: 0 0 6px 0;
             font-size: 1.1em;
-        }}
+        }
         
-        .national-notice p {{
+        .national-notice p {
             margin: 0;
             font-size: 0.9em;
-        }}
+        }
         
-        .summary-cards {{
+        .summary-cards {
             display: grid;
             grid-template-columns: repeat(auto-fit, minmax(180px, 1fr));
             gap: 12px;
             margin-bottom: 20px;
-        }}
+        }
         
-        .notice-grid {{
+        .notice-grid {
             display: grid;
             grid-template-columns: 1fr 1fr;
             gap: 12px;
             margin-bottom: 16px;
-        }}
+        }
         
-        @media (max-width: 768px) {{
-            .notice-grid {{
+        @media (max-width: 768px) {
+            .notice-grid {
                 grid-template-columns: 1fr;
-            }}
-        }}
+            }
+        }
         
-        .summary-card {{
+        .summary-card {
             background: white;
             padding: 14px;
             border-radius: 10px;
             box-shadow: 0 2px 8px rgba(0,0,0,0.06);
             text-align: center;
             border-left: 4px solid #667eea;
-        }}
+        }
         
-        .summary-card h3 {{
+        .summary-card h3 {
             margin: 0 0 6px 0;
             color: #667eea;
             font-size: 1.1em;
-        }}
+        }
         
-        .summary-card .number {{
+        .summary-card .number {
             font-size: 1.8em;
             font-weight: bold;
             color: #333;
             margin: 6px 0;
-        }}
+        }
         
-        .summary-card p {{
+        .summary-card p {
             margin: 0;
             font-size: 0.85em;
-        }}
+        }
         
-        .recommendations {{
+        .recommendations {
             background: white;
             padding: 18px;
             border-radius: 10px;
             box-shadow: 0 2px 8px rgba(0,0,0,0.06);
             margin-bottom: 20px;
-        }}
+        }
         
-        .recommendations h2 {{
+        .recommendations h2 {
             color: #667eea;
             margin: 0 0 12px 0;
             font-size: 1.4em;
             border-bottom: 2px solid #eee;
             padding-bottom: 8px;
-        }}
+        }
         
-        .recommendation-grid {{
+        .recommendation-grid {
             display: grid;
             grid-template-columns: repeat(auto-fit, minmax(260px, 1fr));
             gap: 12px;
             margin-top: 12px;
-        }}
+        }
         
-        .recommendation-item {{
+        .recommendation-item {
             padding: 14px;
             border-radius: 8px;
             border-left: 4px solid;
-        }}
+        }
         
-        .recommendation-item h4 {{
+        .recommendation-item h4 {
             margin: 0 0 8px 0;
             font-size: 1.1em;
-        }}
+        }
         
-        .recommendation-item p {{
+        .recommendation-item p {
             margin: 0 0 8px 0;
             font-size: 0.9em;
-        }}
+        }
         
-        .recommendation-item ul {{
+        .recommendation-item ul {
             margin: 8px 0;
             padding-left: 16px;
-        }}
+        }
         
-        .recommendation-item li {{
+        .recommendation-item li {
             font-size: 0.85em;
             margin-bottom: 4px;
-        }}
+        }
         
-        .recommendation-item em {{
+        .recommendation-item em {
             font-size: 0.8em;
-        }}
+        }
         
-        .rec-excellent {{ 
+        .rec-excellent { 
             background-color: #f0f9ff; 
             border-left-color: #0ea5e9; 
-        }}
+        }
         
-        .rec-improving {{ 
+        .rec-improving { 
             background-color: #f0fdf4; 
             border-left-color: #22c55e; 
-        }}
+        }
         
-        .rec-consistent {{ 
+        .rec-consistent { 
             background-color: #fefce8; 
             border-left-color: #eab308; 
-        }}
+        }
         
-        .rec-strategic {{
+        .rec-strategic {
             background-color: #f8fafc;
             border-left-color: #8b5cf6;
-        }}
+        }
         
-        .competitive-notice {{
+        .competitive-notice {
             background: #fef3c7;
             border: 1px solid #f59e0b;
             border-radius: 8px;
             padding: 12px;
-        }}
+        }
         
-        .competitive-notice h4 {{
+        .competitive-notice h4 {
             color: #d97706;
             margin: 0 0 6px 0;
             font-size: 1.05em;
-        }}
+        }
         
-        .competitive-schools {{
+        .competitive-schools {
             font-style: italic;
             color: #92400e;
             font-weight: 500;
-        }}
+        }
         
-        .highly-competitive {{
+        .highly-competitive {
             opacity: 0.4;
             font-size: 0.9em;
             color: #6b7280 !important;
-        }}
+        }
         
-        .highly-competitive .school-name {{
+        .highly-competitive .school-name {
             color: #9ca3af !important;
-        }}
+        }
         
-        .highly-competitive td {{
+        .highly-competitive td {
             color: #9ca3af !important;
-        }}
+        }
         
-        .private-school {{
+        .private-school {
             opacity: 0.3;
             font-size: 0.9em;
             color: #d97706 !important;
             background-color: #fef3c7 !important;
-        }}
+        }
         
-        .private-school .school-name {{
+        .private-school .school-name {
             color: #92400e !important;
-        }}
+        }
         
-        .private-school td {{
+        .private-school td {
             color: #92400e !important;
-        }}
+        }
         
-        .schools-table {{
+        .schools-table {
             background: white;
             border-radius: 12px;
             overflow: hidden;
             box-shadow: 0 4px 15px rgba(0,0,0,0.1);
             margin-bottom: 30px;
-        }}
+        }
         
-        .table-header {{
+        .table-header {
             background: #667eea;
             color: white;
             padding: 20px;
             font-size: 1.3em;
             font-weight: 500;
-        }}
+        }
         
-        table {{
+        table {
             width: 100%;
             border-collapse: collapse;
             font-size: 0.9em;
-        }}
+        }
         
-        th, td {{
+        th, td {
             padding: 12px 8px;
             text-align: center;
             border-bottom: 1px solid #eee;
-        }}
+        }
         
-        th {{
+        th {
             background-color: #f8fafc;
             font-weight: 600;
             color: #4a5568;
             position: sticky;
             top: 0;
-        }}
+        }
         
-        .school-name {{
+        .school-name {
             text-align: left !important;
             font-weight: 500;
             max-width: 200px;
             padding-left: 15px !important;
-        }}
+        }
         
-        .place-cell {{
+        .place-cell {
             font-weight: bold;
-        }}
+        }
         
-        .score-cell {{
+        .score-cell {
             font-weight: 500;
-        }}
+        }
+        
+        /* Highlight row on hover */
+        tbody tr:hover { background-color: #f8fafc; }
         
         /* Performance categories */
-        .excellent {{ background-color: #dcfce7; color: #166534; }}
-        .very-good {{ background-color: #dbeafe; color: #1e40af; }}
-        .good {{ background-color: #fef3c7; color: #92400e; }}
-        .average {{ background-color: #fee2e2; color: #991b1b; }}
-        .no-data {{ background-color: #f3f4f6; color: #6b7280; }}
+        .excellent { background-color: #dcfce7; color: #166534; }
+        .very-good { background-color: #dbeafe; color: #1e40af; }
+        .good { background-color: #fef3c7; color: #92400e; }
+        .average { background-color: #fee2e2; color: #991b1b; }
+        .no-data { background-color: #f3f4f6; color: #6b7280; }
         
         /* Trend indicators */
-        .trend-arrow {{
+        .trend-arrow {
             font-weight: bold;
             font-size: 1.2em;
-        }}
+        }
         
-        .trend-up {{ color: #16a34a; }}
-        .trend-down {{ color: #dc2626; }}
-        .trend-stable {{ color: #6b7280; }}
+        .trend-up { color: #16a34a; }
+        .trend-down { color: #dc2626; }
+        .trend-stable { color: #6b7280; }
         
-        .responsive-table {{
+        .responsive-table {
             overflow-x: auto;
-        }}
-        
-        @media (max-width: 768px) {{
-            .header h1 {{ font-size: 1.8em; }}
-            .header p {{ font-size: 0.9em; }}
-            .content {{ padding: 15px; }}
-            .summary-cards {{ grid-template-columns: 1fr; gap: 10px; }}
-            .recommendation-grid {{ grid-template-columns: 1fr; }}
-            .notice-grid {{ grid-template-columns: 1fr; }}
-        }}
-        
-        .footer {{
+        }
+        
+        @media (max-width: 768px) {
+            .header h1 { font-size: 1.8em; }
+            .header p { font-size: 0.9em; }
+            .content { padding: 15px; }
+            .summary-cards { grid-template-columns: 1fr; gap: 10px; }
+            .recommendation-grid { grid-template-columns: 1fr; }
+            .notice-grid { grid-template-columns: 1fr; }
+        }
+        
+        .footer {
             text-align: center;
             margin-top: 40px;
             padding: 20px;
             color: #6b7280;
             font-size: 0.9em;
-        }}
+        }
+        
+        /* Shared by repeated elements instead of inline styles */
+        .strategy-card { background: white; padding: 20px; border-radius: 8px; box-shadow: 0 2px 4px rgba(0,0,0,0.1); }
+        .strategy-card ul { margin: 8px 0; padding-left: 20px; }
+        .source-link { color: #0369a1; text-decoration: none; }
     </style>
 </head>
 <body>
@@ -615,22 +675,22 @@ html_content = f'''<!DOCTYPE html>
     <div class="summary-cards">
         <div class="summary-card">
             <h3>Tallinn Schools</h3>
-            <div class="number">{stats['total_schools']}</div>
+            <div class="number">${total_schools}</div>
             <p>gymnasiums analyzed</p>
         </div>
         <div class="summary-card">
             <h3>Best in Estonia</h3>
-            <div class="number">{format_score(stats['top_performer']['Kokku_2024'])}</div>
-            <p>{stats['top_performer']['School']}</p>
+            <div class="number">${top_score}</div>
+            <p>${top_school}</p>
         </div>
         <div class="summary-card">
             <h3>Excellence Tier</h3>
-            <div class="number">{stats['excellent_count']}</div>
+            <div class="number">${excellent_count}</div>
             <p>Schools scoring 250+ points</p>
         </div>
         <div class="summary-card">
             <h3>Improving</h3>
-            <div class="number">{stats['improving_count']}</div>
+            <div class="number">${improving_count}</div>
             <p>Schools trending upward</p>
         </div>
     </div>
@@ -658,20 +718,7 @@ html_content = f'''<!DOCTYPE html>
             <div class="recommendation-item rec-excellent">
                 <h4>🏆 Excellent & Accessible</h4>
                 <p><strong>High-quality schools with better admission chances:</strong></p>
-                <ul>'''
-
-# Add accessible excellent schools (exclude competitive and private schools)
-accessible_excellent = [s for s in schools_data if s['category'] in ['very-good'] and s['Kokku_2024'] and 
-                        not any(comp in s['School'] for comp in ['Tallinna Reaalkool', 'Tallinna Inglise Kolledž', 'Gustav Adolfi', 'Tallinna Prantsuse', 'Tallinna 21. Kool', 'Kadrioru Saksa']) and
-                        not s.get('is_private', False)]
-accessible_excellent.sort(key=lambda x: x['Kokku_2024'], reverse=True)
-
-for school in accessible_excellent[:3]:
-    national_rank = school['Place_2024'] if school['Place_2024'] != '—' else 'N/A'
-    html_content += f'''
-                    <li>{school['School']} - {format_score(school['Kokku_2024'])} points (National #{national_rank})</li>'''
-
-html_content += '''
+                <ul>${excellent_items}
                 </ul>
                 <p><em>These schools offer excellent education quality with more realistic admission prospects.</em></p>
             </div>
@@ -679,19 +726,7 @@ html_content += '''
             <div class="recommendation-item rec-improving">
                 <h4>📈 Rising Stars (Best Value)</h4>
                 <p><strong>Schools showing significant improvement trajectory:</strong></p>
-                <ul>'''
-
-# Add improving schools (exclude private schools)
-improving_schools = [s for s in schools_data if s['trend_cat'] == 'improving' and s['Kokku_2024'] and not s.get('is_private', False)]
-improving_schools.sort(key=lambda x: x['place_change_1yr'] or 0, reverse=True)
-
-for school in improving_schools[:4]:
-    place_change = school['place_change_1yr'] or 0
-    national_rank = school['Place_2024'] if school['Place_2024'] != '—' else 'N/A'
-    html_content += f'''
-                    <li>{school['School']} - National #{national_rank} (+{place_change} places improvement)</li>'''
-
-html_content += '''
+                <ul>${improving_items}
                 </ul>
                 <p><em>These schools are rapidly improving and offer great opportunities for growth.</em></p>
             </div>
@@ -699,18 +734,7 @@ html_content += '''
             <div class="recommendation-item rec-consistent">
                 <h4>🎯 Solid & Reliable Choices</h4>
                 <p><strong>Dependable schools with good performance:</strong></p>
-                <ul>'''
-
-# Add solid performing schools (exclude private schools)
-solid_schools = [s for s in schools_data if s['category'] in ['good'] and s['Kokku_2024'] and s['trend_cat'] == 'stable' and not s.get('is_private', False)]
-solid_schools.sort(key=lambda x: x['Kokku_2024'], reverse=True)
-
-for school in solid_schools[:4]:
-    national_rank = school['Place_2024'] if school['Place_2024'] != '—' else 'N/A'
-    html_content += f'''
-                    <li>{school['School']} - {format_score(school['Kokku_2024'])} points (National #{national_rank})</li>'''
-
-html_content += '''
+                <ul>${solid_items}
                 </ul>
                 <p><em>These schools provide consistent quality education with reasonable admission requirements.</em></p>
             </div>
@@ -738,49 +762,24 @@ html_content += '''
                         <th>Performance</th>
                     </tr>
                 </thead>
-                <tbody>'''
-
-# Generate table rows
-highly_competitive = ['Tallinna Reaalkool', 'Tallinna Inglise Kolledž', 'Gustav Adolfi Gümnaasium', 
-                     'Tallinna Prantsuse Lütseum', 'Tallinna 21. Kool', 'Kadrioru Saksa Gümnaasium']
-
-for school in schools_data:
-    is_competitive = any(comp in school['School'] for comp in highly_competitive)
-    is_private = school.get('is_private', False)
-    
-    # Determine row class and styling
-    if is_private:
-        row_class = ' class="private-school"'
-        school_name = school['School'] + ' 💼'
-        performance = 'Private School'
-    elif is_competitive:
-        row_class = ' class="highly-competitive"'
-        school_name = school['School'] + ' ⭐'
-        performance = 'Highly Competitive'
-    else:
-        row_class = ''
-        school_name = school['School']
-        performance = school['category'].title().replace('-', ' ')
-    
-    # Format trend display
-    trend_class = f"trend-{school['trend_cat']}"
-    trend_arrow = school.get('trend_arrow', '→')
-    
-    html_content += f'''
-                    <tr{row_class}>
-                        <td class="school-name">{school_name}</td>
-                        <td class="place-cell">{school['Place_2018'] if school['Place_2018'] != '—' else '—'}</td>
-                        <td class="place-cell">{school['Place_2023'] if school['Place_2023'] != '—' else '—'}</td>
-                        <td class="place-cell">{school['Place_2024'] if school['Place_2024'] != '—' else '—'}</td>
-                        <td class="{trend_class}"><span class="trend-arrow">{trend_arrow}</span></td>
-                        <td class="score-cell {school['category']}">{format_score(school['Kokku_2024'])}</td>
-                        <td class="score-cell">{format_score(school['Math_2024'])}</td>
-                        <td class="score-cell">{format_score(school['Estonian_2024'])}</td>
-                        <td class="score-cell">{format_score(school['English_2024'])}</td>
-                        <td class="{school['category']}">{performance}</td>
+                <tbody>''')
+
+# One table row per school (str.format fields are attributes of the school row)
+ROW_TMPL = '''
+                    <tr{0.row_class}>
+                        <td class="school-name">{0.School_cell}</td>
+                        <td class="place-cell">{0.Place_2018}</td>
+                        <td class="place-cell">{0.Place_2023}</td>
+                        <td class="place-cell">{0.Place_2024}</td>
+                        <td class="trend-{0.trend_cat}"><span class="trend-arrow">{0.trend_arrow}</span></td>
+                        <td class="score-cell {0.category}">{0.Kokku_2024_str}</td>
+                        <td class="score-cell">{0.Math_2024_str}</td>
+                        <td class="score-cell">{0.Estonian_2024_str}</td>
+                        <td class="score-cell">{0.English_2024_str}</td>
+                        <td class="{0.category}">{0.performance}</td>
                     </tr>'''
 
-html_content += '''
+FOOTER_TMPL = Template('''
                 </tbody>
             </table>
         </div>
@@ -790,42 +789,15 @@ html_content += '''
         <h2 style="color: #0f172a; margin-bottom: 16px;">📋 Practical Application Strategy</h2>
         
         <div style="display: grid; grid-template-columns: repeat(auto-fit, minmax(300px, 1fr)); gap: 20px;">
-            <div style="background: white; padding: 20px; border-radius: 8px; box-shadow: 0 2px 4px rgba(0,0,0,0.1);">
+            <div class="strategy-card">
                 <h4 style="color: #16a34a; margin-bottom: 12px;">🎯 Recommended Application List</h4>
-                <ul style="margin: 8px 0; padding-left: 20px;">'''
-
-# Add top realistic recommendations with national rankings
-accessible_schools = [s for s in schools_data if s['category'] in ['very-good', 'good'] and 
-                     not any(comp in s['School'] for comp in highly_competitive) and s['Kokku_2024'] and
-                     not s.get('is_private', False)]
-accessible_schools.sort(key=lambda x: x['Kokku_2024'], reverse=True)
-
-if accessible_schools:
-    top_school = accessible_schools[0]
-    national_rank = top_school['Place_2024'] if top_school['Place_2024'] != '—' else 'N/A'
-    html_content += f'''
-                    <li><strong>Top Choice:</strong> {top_school['School']} (National #{national_rank})</li>'''
-    
-    if len(accessible_schools) > 2:
-        school1, school2 = accessible_schools[1], accessible_schools[2]
-        rank1 = school1['Place_2024'] if school1['Place_2024'] != '—' else 'N/A'
-        rank2 = school2['Place_2024'] if school2['Place_2024'] != '—' else 'N/A'
-        html_content += f'''
-                    <li><strong>Solid Options:</strong> {school1['School']} (#{rank1}), {school2['School']} (#{rank2})</li>'''
-    
-    improving_accessible = [s for s in improving_schools if not any(comp in s['School'] for comp in highly_competitive) and not s.get('is_private', False)][:2]
-    if improving_accessible:
-        improving_text = ', '.join([f"{s['School']} (#{s['Place_2024'] if s['Place_2024'] != '—' else 'N/A'})" for s in improving_accessible])
-        html_content += f'''
-                    <li><strong>Rising Stars:</strong> {improving_text}</li>'''
-
-html_content += '''
+                <ul>${application_items}
                 </ul>
             </div>
             
-            <div style="background: white; padding: 20px; border-radius: 8px; box-shadow: 0 2px 4px rgba(0,0,0,0.1);">
+            <div class="strategy-card">
                 <h4 style="color: #dc2626; margin-bottom: 12px;">⚡ Understanding National Rankings</h4>
-                <ul style="margin: 8px 0; padding-left: 20px;">
+                <ul>
                     <li><strong>Rankings 1-10:</strong> Elite national level - extremely competitive</li>
                     <li><strong>Rankings 11-25:</strong> Excellent schools - very competitive</li>
                     <li><strong>Rankings 26-50:</strong> Very good schools - competitive</li>
@@ -854,42 +826,105 @@ html_content += '''
         <div style="background: #f0f9ff; border: 1px solid #0ea5e9; border-radius: 8px; padding: 16px; margin-top: 16px;">
             <p style="color: #0c4a6e; font-size: 0.9em; margin: 0; text-align: center;">
                 📊 <strong>Data Sources:</strong> All data are based on open sources from Postimees:<br>
-                <a href="https://rus.postimees.ee/6465418/luchshaya-estonskaya-shkola-nahoditsya-v-tallinne" style="color: #0369a1; text-decoration: none;">2018 School Rankings</a> • 
-                <a href="https://rus.postimees.ee/7953716/bolshoy-obzor-rezultaty-gosekzamenov-v-gimnaziyah-kto-vozglavlyaet-reyting-russkoyazychnyh-shkol-estonii" style="color: #0369a1; text-decoration: none;">2024 State Exam Results</a> • 
-                <a href="https://services.postimees.ee/infography/2025/2507-koolide-edetabel/eestiTOP/index.html?id=eestiTOP" style="color: #0369a1; text-decoration: none;">Interactive Rankings</a>
+                <a href="https://rus.postimees.ee/6465418/luchshaya-estonskaya-shkola-nahoditsya-v-tallinne" class="source-link">2018 School Rankings</a> • 
+                <a href="https://rus.postimees.ee/7953716/bolshoy-obzor-rezultaty-gosekzamenov-v-gimnaziyah-kto-vozglavlyaet-reyting-russkoyazychnyh-shkol-estonii" class="source-link">2024 State Exam Results</a> • 
+                <a href="https://services.postimees.ee/infography/2025/2507-koolide-edetabel/eestiTOP/index.html?id=eestiTOP" class="source-link">Interactive Rankings</a>
             </p>
         </div>
         </div>
     </div>
     </div>
-    
-    <script>
-        // Add some interactivity
-        document.addEventListener('DOMContentLoaded', function() {{
-            // Highlight row on hover
-            const rows = document.querySelectorAll('tbody tr');
-            rows.forEach(row => {{
-                row.addEventListener('mouseenter', function() {{
-                    this.style.backgroundColor = '#f8fafc';
-                }});
-                row.addEventListener('mouseleave', function() {{
-                    this.style.backgroundColor = '';
-                }});
-            }});
-        }});
-    </script>
 </body>
-</html>'''
+</html>''')
 
-# Backup previous report before creating new one
-report_filename = 'school_selection_report_corrected.html'
-backup_previous_report(report_filename)
+# Add accessible excellent schools (exclude competitive and private schools)
+excellent_items = []
+for school in accessible_excellent[:3]:
+    national_rank = school.Place_2024 if school.Place_2024 != '—' else 'N/A'
+    excellent_items.append(f'''
+                    <li>{school.School_html} - {school.Kokku_2024_str} points (National #{national_rank})</li>''')
+
+# Add improving schools (exclude private schools) - an improving trend always has a place change
+by_place_change = attrgetter('place_change_1yr')
+improving_items = []
+for school in heapq.nlargest(4, improving_schools, key=by_place_change):
+    place_change = school.place_change_1yr
+    national_rank = school.Place_2024 if school.Place_2024 != '—' else 'N/A'
+    improving_items.append(f'''
+                    <li>{school.School_html} - National #{national_rank} (+{place_change} places improvement)</li>''')
 
-# Write the new HTML file
-with open(report_filename, 'w', encoding='utf-8') as f:
-    f.write(html_content)
+# Add solid performing schools (exclude private schools)
+solid_items = []
+for school in solid_schools[:4]:
+    national_rank = school.Place_2024 if school.Place_2024 != '—' else 'N/A'
+    solid_items.append(f'''
+                    <li>{school.School_html} - {school.Kokku_2024_str} points (National #{national_rank})</li>''')
+
+# Add top realistic recommendations with national rankings
+application_items = []
+top_accessible = accessible_schools[:3]
+
+if top_accessible:
+    top_school = top_accessible[0]
+    national_rank = top_school.Place_2024 if top_school.Place_2024 != '—' else 'N/A'
+    application_items.append(f'''
+                    <li><strong>Top Choice:</strong> {top_school.School_html} (National #{national_rank})</li>''')
+    
+    if len(top_accessible) > 2:
+        school1, school2 = top_accessible[1], top_accessible[2]
+        rank1 = school1.Place_2024 if school1.Place_2024 != '—' else 'N/A'
+        rank2 = school2.Place_2024 if school2.Place_2024 != '—' else 'N/A'
+        application_items.append(f'''
+                    <li><strong>Solid Options:</strong> {school1.School_html} (#{rank1}), {school2.School_html} (#{rank2})</li>''')
+    
+    improving_accessible = heapq.nlargest(2, (s for s in improving_schools if not s.is_competitive),
+                                          key=by_place_change)
+    if improving_accessible:
+        improving_text = ', '.join([f"{s.School_html} (#{s.Place_2024 if s.Place_2024 != '—' else 'N/A'})" for s in improving_accessible])
+        application_items.append(f'''
+                    <li><strong>Rising Stars:</strong> {improving_text}</li>''')
+
+# Whitespace between tags - only the indentation of the templates (no inline elements are split by it)
+TAG_GAP_RE = re.compile(rb'>\s+<')
+
+# Assemble the page: header, one table row per school (ROW_TMPL.format per row), footer.
+# The report is tens of KB, so it is built once, encoded once and minified in one pass
+html_bytes = TAG_GAP_RE.sub(b'><', ''.join([
+    HEADER_TMPL.substitute(
+        total_schools=stats['total_schools'],
+        top_score=format_score(stats['top_performer'].Kokku_2024),
+        top_school=stats['top_performer'].School_html,
+        excellent_count=stats['excellent_count'],
+        improving_count=stats['improving_count'],
+        excellent_items=''.join(excellent_items),
+        improving_items=''.join(improving_items),
+        solid_items=''.join(solid_items)
+    ),
+    *map(ROW_TMPL.format, schools_data),
+    FOOTER_TMPL.substitute(application_items=''.join(application_items)),
+]).encode('utf-8'))
+
+# Skip backup and write when the page matches the last one written (hash in a sidecar file)
+report_filename = 'school_selection_report_corrected.html'
+hash_path = Path(f'{report_filename}.hash')
+report_hash = hashlib.blake2b(html_bytes, digest_size=16).hexdigest()
+try:
+    unchanged = os.path.exists(report_filename) and hash_path.read_text() == report_hash
+except FileNotFoundError:
+    unchanged = False
+
+if unchanged:
+    print("📝 Report unchanged since last run - keeping existing file")
+else:
+    # Backup previous report before creating new one
+    backup_previous_report(report_filename)
+    write_report(report_filename, html_bytes)
+    # Record the hash only once the report is written (atomic replace)
+    tmp_hash_path = hash_path.with_name(f'{hash_path.name}.tmp')
+    tmp_hash_path.write_text(report_hash)
+    os.replace(tmp_hash_path, hash_path)
+    print("✅ Enhanced report generated: school_selection_report_corrected.html")
 
-print("✅ Enhanced report generated: school_selection_report_corrected.html")
 print("✅ Data sourced directly from original CSV files")
 print("✅ Preserves NATIONAL rankings (not just Tallinn rankings)")
 print(f"✅ {len(schools_data)} schools processed with accurate national context")